@@ -1,3 +1,5 @@
+from collections import deque
+
 import streamlit as st
 from utils import load_css
 from components import (
@@ -22,7 +24,8 @@ load_css()
 
 # Initialize session state if not already initialized
 if "predictions" not in st.session_state:
-    st.session_state.predictions = []
+    # Bounded deque keeps appends O(1) and caps history memory
+    st.session_state.predictions = deque(maxlen=50)
 if "current_page" not in st.session_state:
     st.session_state.current_page = "Predict"
 
@@ -2,34 +2,88 @@
 UI components for the Traffic Severity Prediction app.
 """
 import streamlit as st
-import pandas as pd
-import numpy as np
-import folium
-from streamlit_folium import folium_static
 from datetime import datetime
-import plotly.express as px
-import plotly.graph_objects as go
 from utils import (
-    get_severity_color, 
-    get_severity_label, 
     save_prediction, 
-    plot_prediction_history,
-    plot_parameter_importance,
+    get_history_figures,
     get_predictions_dataframe,
-    generate_download_link
+    show_download_button
 )
 from model_loader import predict_severity
 from config import (
     APP_TITLE, 
     APP_DESCRIPTION, 
-    PAGES, 
-    DEFAULT_VALUES,
-    PARAMETER_RANGES,
-    PARAMETER_UNITS,
-    PARAMETER_HELP,
-    SEVERITY_CLASSES,
-    DEFAULT_MAP_ZOOM,
-    MAP_STYLE
+    PAGES,
+    PAGES_BY_LABEL,
+    PARAMS,
+    SEVERITY_LABELS,
+    SEVERITY_COLORS,
+    SEVERITY_DESCS,
+    DEFAULT_MAP_ZOOM
+)
+
+# Display labels for the parameter values table (model feature order)
+_PARAM_TABLE_LABELS = (
+    "Longitude", "Latitude", "Distance (km)",
+    "Temperature (°C)", "Humidity (%)",
+    "Pressure (hPa)", "Hour", "Duration (min)"
+)
+
+# Packed parameter metadata unpacked once at import (model feature order)
+(_P_LON, _P_LAT, _P_DIST, _P_TEMP,
+ _P_HUM, _P_PRES, _P_HOUR, _P_DUR) = PARAMS
+
+# Static sidebar content precomputed once; emitting it as two markdown
+# calls (header + body) instead of six keeps per-rerun element diffs down
+_SIDEBAR_HEADER = f"""
+<div style="text-align: center; margin-bottom: 20px;">
+    <div style="font-size: 40px;">🚦</div>
+    <h2>{APP_TITLE}</h2>
+</div>
+"""
+
+_SIDEBAR_STATIC = """
+---
+### About This App
+
+This application predicts traffic severity based on environmental
+and temporal factors using machine learning.
+
+---
+### Input Parameters
+
+- **Location**: Longitude and latitude coordinates
+- **Distance**: Distance from major intersection (km)
+- **Weather**: Temperature, humidity, and pressure
+- **Time**: Hour of day and duration
+
+---
+© 2025 Traffic Severity Predictor
+"""
+
+# Reusable template for the prediction result card; formatted per click
+# instead of re-assembling the CSS strings in an f-string
+_RESULT_TMPL = (
+    '<div class="prediction-result" style="background-color: {c}30; '
+    'color: {c}; border: 2px solid {c}">'
+    '<div style="font-size: 32px; margin-bottom: 10px;">{label}</div>'
+    '<div style="font-size: 16px;">{desc}</div>'
+    '</div>'
+)
+
+# Precomputed severity scale reference (SEVERITY_CLASSES is constant, so the
+# HTML never changes between reruns)
+SEVERITY_SCALE_HTML = "".join(
+    f"""
+    <div style="padding: 10px;
+                margin-bottom: 10px;
+                border-radius: 5px;
+                background-color: {SEVERITY_COLORS[severity]}30;
+                border-left: 5px solid {SEVERITY_COLORS[severity]}">
+        <strong>{SEVERITY_LABELS[severity]}</strong>: {SEVERITY_DESCS[severity]}
+    </div>
+    """
+    for severity in range(4)
 )
 
 def show_header():
@@ -60,76 +114,58 @@ def show_header():
 def show_sidebar():
     """Display the sidebar navigation and return the selected page."""
     with st.sidebar:
-        st.markdown(
-            f"""
-            <div style="text-align: center; margin-bottom: 20px;">
-                <div style="font-size: 40px;">🚦</div>
-                <h2>{APP_TITLE}</h2>
-            </div>
-            """, 
-            unsafe_allow_html=True
-        )
-        
+        st.markdown(_SIDEBAR_HEADER, unsafe_allow_html=True)
+
         selected_page = st.radio("Navigation", list(PAGES.values()))
-        
+
         # Get the key for the selected page value
-        for key, value in PAGES.items():
-            if value == selected_page:
-                st.session_state.current_page = key
-                break
-        
-        st.markdown("---")
-        st.markdown("### About This App")
-        st.markdown(
-            """
-            This application predicts traffic severity based on environmental 
-            and temporal factors using machine learning.
-            """
-        )
-        
-        st.markdown("---")
-        st.markdown("### Input Parameters")
-        st.markdown(
-            """
-            - **Location**: Longitude and latitude coordinates
-            - **Distance**: Distance from major intersection (km)
-            - **Weather**: Temperature, humidity, and pressure
-            - **Time**: Hour of day and duration
-            """
-        )
-        
-        st.markdown("---")
-        st.markdown("© 2025 Traffic Severity Predictor")
-    
+        st.session_state.current_page = PAGES_BY_LABEL[selected_page]
+
+        st.markdown(_SIDEBAR_STATIC)
+
     return st.session_state.current_page
 
-def create_map(longitude, latitude):
-    """Create an interactive map centered at the specified coordinates."""
-    # Create a map centered at the specified location
-    m = folium.Map(
-        location=[latitude, longitude],
-        zoom_start=DEFAULT_MAP_ZOOM,
-        tiles=MAP_STYLE
+def show_location_map(longitude, latitude):
+    """Display a lightweight map with a marker at the specified coordinates.
+
+    The map is an embedded OpenStreetMap page referenced by URL, so Streamlit
+    only sends a short iframe tag per rerun and the browser caches the map
+    page and tiles itself.
+    """
+    # Bounding box sized to roughly match DEFAULT_MAP_ZOOM
+    delta = 360.0 / (2 ** DEFAULT_MAP_ZOOM)
+    src = (
+        "https://www.openstreetmap.org/export/embed.html"
+        f"?bbox={longitude - delta}%2C{latitude - delta}"
+        f"%2C{longitude + delta}%2C{latitude + delta}"
+        f"&layer=mapnik&marker={latitude}%2C{longitude}"
+    )
+    st.components.v1.iframe(src, width=600, height=300)
+
+def _param_number_input(param, fmt):
+    """Emit a number input from a packed parameter tuple."""
+    _, label, min_value, max_value, default, step, help_text = param
+    return st.number_input(
+        label,
+        min_value=min_value,
+        max_value=max_value,
+        value=default,
+        step=step,
+        format=fmt,
+        help=help_text
+    )
+
+def _param_slider(param):
+    """Emit a slider from a packed parameter tuple."""
+    _, label, min_value, max_value, default, step, help_text = param
+    return st.slider(
+        label,
+        min_value=min_value,
+        max_value=max_value,
+        value=default,
+        step=step,
+        help=help_text
     )
-    
-    # Add a marker at the specified location
-    folium.Marker(
-        location=[latitude, longitude],
-        popup="Selected Location",
-        icon=folium.Icon(color="red", icon="info-sign")
-    ).add_to(m)
-    
-    # Add traffic severity visualization (for demonstration)
-    folium.Circle(
-        location=[latitude, longitude],
-        radius=500,  # 500 meters radius
-        color="blue",
-        fill=True,
-        fill_opacity=0.2,
-        popup="Traffic Impact Zone"
-    ).add_to(m)
-    
-    return m
 
 def show_prediction_form():
     """Display the prediction input form."""
@@ -144,41 +180,17 @@ def show_prediction_form():
             
             lon_col, lat_col = st.columns(2)
             with lon_col:
-                longitude = st.number_input(
-                    "Longitude",
-                    min_value=PARAMETER_RANGES["longitude"][0],
-                    max_value=PARAMETER_RANGES["longitude"][1],
-                    value=DEFAULT_VALUES["longitude"],
-                    step=0.0001,
-                    format="%.4f",
-                    help=PARAMETER_HELP["longitude"]
-                )
+                longitude = _param_number_input(_P_LON, "%.4f")
             
             with lat_col:
-                latitude = st.number_input(
-                    "Latitude",
-                    min_value=PARAMETER_RANGES["latitude"][0],
-                    max_value=PARAMETER_RANGES["latitude"][1],
-                    value=DEFAULT_VALUES["latitude"],
-                    step=0.0001,
-                    format="%.4f",
-                    help=PARAMETER_HELP["latitude"]
-                )
+                latitude = _param_number_input(_P_LAT, "%.4f")
             
             # Display the map
             st.markdown("##### Selected Location")
-            m = create_map(longitude, latitude)
-            folium_static(m, width=600, height=300)
+            show_location_map(longitude, latitude)
             
             # Distance parameter
-            distance = st.slider(
-                "Distance from major intersection (km)",
-                min_value=PARAMETER_RANGES["distance"][0],
-                max_value=PARAMETER_RANGES["distance"][1],
-                value=DEFAULT_VALUES["distance"],
-                step=0.1,
-                help=PARAMETER_HELP["distance"]
-            )
+            distance = _param_slider(_P_DIST)
             
             # Environmental parameters
             st.markdown("#### 🌡️ Environmental Parameters")
@@ -186,34 +198,13 @@ def show_prediction_form():
             env_col1, env_col2, env_col3 = st.columns(3)
             
             with env_col1:
-                temperature = st.slider(
-                    "Temperature (°C)",
-                    min_value=PARAMETER_RANGES["temperature"][0],
-                    max_value=PARAMETER_RANGES["temperature"][1],
-                    value=DEFAULT_VALUES["temperature"],
-                    step=0.5,
-                    help=PARAMETER_HELP["temperature"]
-                )
+                temperature = _param_slider(_P_TEMP)
             
             with env_col2:
-                humidity = st.slider(
-                    "Humidity (%)",
-                    min_value=PARAMETER_RANGES["humidity"][0],
-                    max_value=PARAMETER_RANGES["humidity"][1],
-                    value=DEFAULT_VALUES["humidity"],
-                    step=1.0,
-                    help=PARAMETER_HELP["humidity"]
-                )
+                humidity = _param_slider(_P_HUM)
             
             with env_col3:
-                pressure = st.slider(
-                    "Pressure (hPa)",
-                    min_value=PARAMETER_RANGES["pressure"][0],
-                    max_value=PARAMETER_RANGES["pressure"][1],
-                    value=DEFAULT_VALUES["pressure"],
-                    step=0.5,
-                    help=PARAMETER_HELP["pressure"]
-                )
+                pressure = _param_slider(_P_PRES)
             
             # Time parameters
             st.markdown("#### ⏱️ Time Parameters")
@@ -221,24 +212,10 @@ def show_prediction_form():
             time_col1, time_col2 = st.columns(2)
             
             with time_col1:
-                hour = st.slider(
-                    "Hour of day (0-23)",
-                    min_value=PARAMETER_RANGES["hour"][0],
-                    max_value=PARAMETER_RANGES["hour"][1],
-                    value=DEFAULT_VALUES["hour"],
-                    step=1,
-                    help=PARAMETER_HELP["hour"]
-                )
+                hour = _param_slider(_P_HOUR)
             
             with time_col2:
-                time_duration = st.slider(
-                    "Time duration (minutes)",
-                    min_value=PARAMETER_RANGES["time_duration"][0],
-                    max_value=PARAMETER_RANGES["time_duration"][1],
-                    value=DEFAULT_VALUES["time_duration"],
-                    step=1.0,
-                    help=PARAMETER_HELP["time_duration"]
-                )
+                time_duration = _param_slider(_P_DUR)
         
         with col2:
             st.markdown("#### 🔍 Prediction Results")
@@ -256,23 +233,23 @@ def show_prediction_form():
                     severity_class = predict_severity(features)
                     
                     if severity_class is not None:
-                        # Get severity details
-                        severity_info = SEVERITY_CLASSES.get(severity_class, {
-                            "label": "Unknown",
-                            "color": "#CCCCCC",
-                            "description": "Unable to determine severity"
-                        })
-                        
+                        # Get severity details from the flat lookup tuples
+                        if 0 <= severity_class < len(SEVERITY_LABELS):
+                            severity_label = SEVERITY_LABELS[severity_class]
+                            severity_color = SEVERITY_COLORS[severity_class]
+                            severity_desc = SEVERITY_DESCS[severity_class]
+                        else:
+                            severity_label = "Unknown"
+                            severity_color = "#CCCCCC"
+                            severity_desc = "Unable to determine severity"
+
                         # Display result
                         st.markdown(
-                            f"""
-                            <div class="prediction-result" style="background-color: {severity_info['color']}30; 
-                                                                 color: {severity_info['color']}; 
-                                                                 border: 2px solid {severity_info['color']}">
-                                <div style="font-size: 32px; margin-bottom: 10px;">{severity_info['label']}</div>
-                                <div style="font-size: 16px;">{severity_info['description']}</div>
-                            </div>
-                            """,
+                            _RESULT_TMPL.format(
+                                c=severity_color,
+                                label=severity_label,
+                                desc=severity_desc
+                            ),
                             unsafe_allow_html=True
                         )
                         
@@ -287,7 +264,7 @@ def show_prediction_form():
                             "hour": hour,
                             "time_duration": time_duration,
                             "severity_class": severity_class,
-                            "severity_label": severity_info["label"]
+                            "severity_label": severity_label
                         }
                         save_prediction(prediction_data)
                         
@@ -298,65 +275,64 @@ def show_prediction_form():
                         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                         
                         st.markdown(f"**Time of prediction**: {timestamp}")
-                        st.markdown(f"**Severity class**: {severity_class} ({severity_info['label']})")
+                        st.markdown(f"**Severity class**: {severity_class} ({severity_label})")
                         
                         # Display parameter importance
                         st.markdown("#### Parameter Values")
                         
-                        params_df = pd.DataFrame({
-                            "Parameter": [
-                                "Longitude", "Latitude", "Distance (km)", 
-                                "Temperature (°C)", "Humidity (%)", 
-                                "Pressure (hPa)", "Hour", "Duration (min)"
+                        # A plain list of dicts avoids building a pandas
+                        # DataFrame for an 8-row table on every click;
+                        # st.dataframe keeps the index hidden
+                        st.dataframe(
+                            [
+                                {"Parameter": label, "Value": value}
+                                for label, value in zip(_PARAM_TABLE_LABELS, features)
                             ],
-                            "Value": features
-                        })
-                        
-                        st.dataframe(params_df, hide_index=True, use_container_width=True)
+                            hide_index=True,
+                            use_container_width=True
+                        )
                     else:
                         st.error("Failed to make prediction. Please check the input parameters.")
             
-            # Show severity scale reference
+            # Show severity scale reference (single precomputed element)
             st.markdown("#### Severity Scale Reference")
-            
-            for severity in range(4):
-                severity_info = SEVERITY_CLASSES.get(severity, {})
-                
-                st.markdown(
-                    f"""
-                    <div style="padding: 10px; 
-                                margin-bottom: 10px; 
-                                border-radius: 5px; 
-                                background-color: {severity_info.get('color', '#CCCCCC')}30;
-                                border-left: 5px solid {severity_info.get('color', '#CCCCCC')}">
-                        <strong>{severity_info.get('label', 'Unknown')}</strong>: {severity_info.get('description', '')}
-                    </div>
-                    """,
-                    unsafe_allow_html=True
-                )
+            st.markdown(SEVERITY_SCALE_HTML, unsafe_allow_html=True)
+
+@st.fragment
+def _history_plots(df):
+    """Render the two history charts.
+
+    Fragment-scoped so interactions with unrelated widgets rerun only this
+    block rather than recomputing both figures with the whole page.
+    """
+    dist_fig, importance_fig = get_history_figures(df)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Plot prediction distribution
+        if dist_fig is not None:
+            st.plotly_chart(dist_fig, use_container_width=True)
+
+    with col2:
+        # Plot parameter importance
+        if importance_fig is not None:
+            st.plotly_chart(importance_fig, use_container_width=True)
 
 def show_prediction_history():
     """Display the history of predictions."""
+    # Deferred so pages that never plot skip the plotly import cost;
+    # sys.modules makes repeat imports free
+    import plotly.graph_objects as go
+
     st.subheader("Prediction History")
     
     # Get prediction history as dataframe
     df = get_predictions_dataframe()
     
     if df is not None and not df.empty:
-        # Show visualizations
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Plot prediction distribution
-            fig = plot_prediction_history(df)
-            if fig is not None:
-                st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            # Plot parameter importance
-            fig = plot_parameter_importance(df)
-            if fig is not None:
-                st.plotly_chart(fig, use_container_width=True)
+        # Show visualizations (figure dicts cached per history generation)
+        _history_plots(df)
         
         # Show history table
         st.markdown("#### Recent Predictions")
@@ -381,50 +357,34 @@ def show_prediction_history():
             "time_duration": "Duration (min)"
         }
         
-        # Create display dataframe
-        display_df = df[display_columns].copy()
-        display_df.rename(columns=rename_dict, inplace=True)
-        
+        # Create display dataframe; rename already returns a new frame,
+        # so no explicit copy of the history is needed
+        display_df = df.loc[:, display_columns].rename(columns=rename_dict)
+
         # Sort by timestamp (most recent first)
         if "Time" in display_df.columns:
-            display_df.sort_values(by="Time", ascending=False, inplace=True)
+            display_df = display_df.sort_values(by="Time", ascending=False)
         
         # Show table
         st.dataframe(display_df, hide_index=True, use_container_width=True)
         
         # Add download button
         st.markdown("#### Download Data")
-        st.markdown(generate_download_link(df, "traffic_severity_predictions.csv", "Download Complete Prediction History"), unsafe_allow_html=True)
+        show_download_button(df, "traffic_severity_predictions.csv", "Download Complete Prediction History")
     else:
         st.info("No prediction history available. Make some predictions first!")
         
         # Show demo data
         st.markdown("#### Demo Visualization")
         
-        # Create dummy data for demonstration
-        demo_data = {
-            "Severity": ["Minimal", "Minor", "Moderate", "Severe"],
-            "Count": [12, 8, 5, 3],
-            "Color": [
-                SEVERITY_CLASSES[0]["color"],
-                SEVERITY_CLASSES[1]["color"],
-                SEVERITY_CLASSES[2]["color"],
-                SEVERITY_CLASSES[3]["color"]
-            ]
-        }
-        
-        demo_df = pd.DataFrame(demo_data)
-        
-        fig = px.bar(
-            demo_df,
-            x="Severity",
-            y="Count",
-            color="Severity",
-            color_discrete_map=dict(zip(demo_df["Severity"], demo_df["Color"])),
-            title="Sample Prediction Distribution (Demo)"
+        # Build the bar trace directly from the config tuples; no
+        # intermediate DataFrame or color-map dict needed for dummy data
+        fig = go.Figure(
+            data=[go.Bar(x=SEVERITY_LABELS, y=(12, 8, 5, 3), marker_color=SEVERITY_COLORS)]
         )
         
         fig.update_layout(
+            title="Sample Prediction Distribution (Demo)",
             xaxis_title="Severity Level",
             yaxis_title="Number of Predictions",
             showlegend=False,
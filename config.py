@@ -14,6 +14,9 @@ PAGES = {
     "About": "ℹ️ About"
 }
 
+# Reverse lookup from sidebar label back to page key
+PAGES_BY_LABEL = {label: key for key, label in PAGES.items()}
+
 # Model parameters
 DEFAULT_VALUES = {
     "longitude": -73.9857,
@@ -67,6 +70,50 @@ SEVERITY_CLASSES = {
     3: {"label": "Severe", "color": "#F44336", "description": "Severe congestion with significant delays"}
 }
 
+# Widget labels and step sizes for the prediction form
+PARAMETER_LABELS = {
+    "longitude": "Longitude",
+    "latitude": "Latitude",
+    "distance": "Distance from major intersection (km)",
+    "temperature": "Temperature (°C)",
+    "humidity": "Humidity (%)",
+    "pressure": "Pressure (hPa)",
+    "hour": "Hour of day (0-23)",
+    "time_duration": "Time duration (minutes)"
+}
+
+PARAMETER_STEPS = {
+    "longitude": 0.0001,
+    "latitude": 0.0001,
+    "distance": 0.1,
+    "temperature": 0.5,
+    "humidity": 1.0,
+    "pressure": 0.5,
+    "hour": 1,
+    "time_duration": 1.0
+}
+
+# Packed per-parameter metadata (key, label, min, max, default, step, help)
+# in model feature order; saves the form repeated dict lookups per rerun
+PARAMS = tuple(
+    (
+        name,
+        PARAMETER_LABELS[name],
+        PARAMETER_RANGES[name][0],
+        PARAMETER_RANGES[name][1],
+        DEFAULT_VALUES[name],
+        PARAMETER_STEPS[name],
+        PARAMETER_HELP[name]
+    )
+    for name in DEFAULT_VALUES
+)
+
+# Flat severity lookups indexed by class id for hot paths (avoids dict
+# hashing and default-dict allocation on every prediction)
+SEVERITY_LABELS = tuple(SEVERITY_CLASSES[i]["label"] for i in range(4))
+SEVERITY_COLORS = tuple(SEVERITY_CLASSES[i]["color"] for i in range(4))
+SEVERITY_DESCS = tuple(SEVERITY_CLASSES[i]["description"] for i in range(4))
+
 # Map settings
 DEFAULT_MAP_ZOOM = 13
 MAP_STYLE = "OpenStreetMap"
\ No newline at end of file
@@ -3,103 +3,101 @@ Functions for loading and using the traffic severity prediction model.
 """
 import pickle
 import os
+from collections import namedtuple
 import numpy as np
 import streamlit as st
 from sklearn.preprocessing import StandardScaler
 
-# Cache the model loading to improve performance
+Artifacts = namedtuple("Artifacts", "model scaler")
+
+# Cache the artifact loading to improve performance
 @st.cache_resource
-def load_model():
+def load_artifacts():
     """
-    Load the traffic severity prediction model from the pickle file.
-    Returns the model or None if the file doesn't exist.
+    Load the traffic severity prediction model and the feature scaler
+    together from the pickle files.
+
+    Returns an Artifacts tuple; the model is None and the scaler a new
+    standard scaler for any file that doesn't exist.
     """
+    model = None
+    scaler = StandardScaler()
     try:
-        # Check if the model file exists
-        model_path = os.path.join(os.path.dirname(__file__), "model", "traffic_severity_model.pkl")
-        
-        if not os.path.exists(model_path):
-            # For demonstration, create a dummy model folder and return None
-            os.makedirs(os.path.dirname(model_path), exist_ok=True)
-            return None
-            
-        # Load the model
-        with open(model_path, 'rb') as file:
-            model = pickle.load(file)
-        return model
+        model_dir = os.path.join(os.path.dirname(__file__), "model")
+        model_path = os.path.join(model_dir, "traffic_severity_model.pkl")
+        scaler_path = os.path.join(model_dir, "scaler.pkl")
+
+        # For demonstration, create a dummy model folder if needed
+        os.makedirs(model_dir, exist_ok=True)
+
+        # Load the model and scaler in one pass over the disk
+        if os.path.exists(model_path):
+            with open(model_path, 'rb') as file:
+                model = pickle.load(file)
+        if os.path.exists(scaler_path):
+            with open(scaler_path, 'rb') as file:
+                scaler = pickle.load(file)
     except Exception as e:
-        st.error(f"Error loading model: {str(e)}")
-        return None
+        st.error(f"Error loading model artifacts: {str(e)}")
+    return Artifacts(model, scaler)
 
-# Cache the scaler loading to improve performance
-@st.cache_resource
-def load_scaler():
+# Hours considered rush hour by the demo predictor
+_RUSH_HOURS = frozenset((7, 8, 9, 16, 17, 18))
+
+def _rule_predict(hour, distance, duration):
     """
-    Load the scaler used to normalize the input features.
-    Returns the scaler or a new standard scaler if the file doesn't exist.
+    Simple rule-based prediction used when no trained model is available.
+    This will be replaced by the real model when available.
     """
-    try:
-        # Check if the scaler file exists
-        scaler_path = os.path.join(os.path.dirname(__file__), "model", "scaler.pkl")
-        
-        if not os.path.exists(scaler_path):
-            # For demonstration, return a new scaler
-            return StandardScaler()
-            
-        # Load the scaler
-        with open(scaler_path, 'rb') as file:
-            scaler = pickle.load(file)
-        return scaler
-    except Exception as e:
-        st.error(f"Error loading scaler: {str(e)}")
-        return StandardScaler()
+    if hour in _RUSH_HOURS and distance < 10:  # Rush hours
+        if duration > 60:
+            return 3  # Severe
+        elif duration > 30:
+            return 2  # Moderate
+        else:
+            return 1  # Minor
+    elif distance > 30 or duration < 15:
+        return 0  # Minimal
+    else:
+        return 1  # Minor
+
+# Cache predictions so repeat identical feature vectors skip the model call
+@st.cache_data(max_entries=1024, show_spinner=False)
+def _predict_cached(features):
+    """
+    Run the actual prediction for a tuple of input features.
+
+    Predictions are deterministic for a given feature vector, so results are
+    cached and identical re-submissions short-circuit to the prior class.
+    """
+    model, scaler = load_artifacts()
+
+    # If model is not available, use a dummy prediction for demonstration
+    if model is None:
+        return _rule_predict(int(features[6]), features[2], features[7])
+
+    # Preprocess the input features; allocated per call since a shared
+    # buffer could be clobbered by a concurrent session's script thread
+    features_array = np.array(features, dtype=np.float64).reshape(1, -1)
+    normalized_features = scaler.transform(features_array)
+
+    # Make prediction
+    prediction = model.predict(normalized_features)[0]
+    return int(prediction)
 
 def predict_severity(features):
     """
     Predict traffic severity using the loaded model.
-    
+
     Args:
-        features: List of input features [Longitude, Latitude, Distance, Temperature, 
+        features: List of input features [Longitude, Latitude, Distance, Temperature,
                                           Humidity, Pressure, Hour, Time Duration]
-    
+
     Returns:
         Predicted severity class (0-3) or None if prediction fails
     """
     try:
-        model = load_model()
-        scaler = load_scaler()
-        
-        # If model is not available, use a dummy prediction for demonstration
-        if model is None:
-            # Simple dummy model for demonstration purposes
-            # This will be replaced by the real model when available
-            features_array = np.array(features).reshape(1, -1)
-            normalized_features = features_array
-            
-            # Simple rule-based prediction for demonstration
-            hour = features[6]
-            distance = features[2]
-            duration = features[7]
-            
-            if hour in [7, 8, 9, 16, 17, 18] and distance < 10:  # Rush hours
-                if duration > 60:
-                    return 3  # Severe
-                elif duration > 30:
-                    return 2  # Moderate
-                else:
-                    return 1  # Minor
-            elif distance > 30 or duration < 15:
-                return 0  # Minimal
-            else:
-                return 1  # Minor
-        
-        # Preprocess the input features
-        features_array = np.array(features).reshape(1, -1)
-        normalized_features = scaler.transform(features_array)
-        
-        # Make prediction
-        prediction = model.predict(normalized_features)[0]
-        return int(prediction)
+        return _predict_cached(tuple(features))
     except Exception as e:
         st.error(f"Error making prediction: {str(e)}")
         return None
\ No newline at end of file
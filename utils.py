@@ -1,30 +1,52 @@
 """
 Utility functions for the Traffic Severity Prediction app.
 """
+import numpy as np
 import pandas as pd
 import streamlit as st
-import matplotlib.pyplot as plt
-import plotly.express as px
-import plotly.graph_objects as go
+from collections import deque
+from functools import cache
 from io import BytesIO
-from config import SEVERITY_CLASSES
-import base64
+from pathlib import Path
 from datetime import datetime
-import os
+from config import SEVERITY_CLASSES, SEVERITY_LABELS, SEVERITY_COLORS
+import time
 
-def load_css():
-    """Load custom CSS styles."""
-    css = """
+# Compact dtypes for the history dataframe; halving the feature width
+# halves memory bandwidth through the correlation and counting kernels
+_HISTORY_DTYPES = {
+    "longitude": "float32",
+    "latitude": "float32",
+    "distance": "float32",
+    "temperature": "float32",
+    "humidity": "float32",
+    "pressure": "float32",
+    "hour": "int8",
+    "time_duration": "float32",
+    "severity_class": "int8"
+}
+
+# Severity class to label/color maps for vectorized Series.map lookups
+_LABEL_MAP = {cls: info.get("label", "Unknown") for cls, info in SEVERITY_CLASSES.items()}
+_COLOR_MAP = {cls: info.get("color", "#CCCCCC") for cls, info in SEVERITY_CLASSES.items()}
+
+# Label to color map for plotly's color_discrete_map, derived once from
+# SEVERITY_CLASSES instead of rebuilt on every plot call
+_SEVERITY_COLOR_DISCRETE_MAP = {
+    _LABEL_MAP[cls]: _COLOR_MAP[cls] for cls in SEVERITY_CLASSES
+}
+
+# Custom CSS built once at import; load_css only re-emits the constant
+_CSS = """
     <style>
         .severity-card {
             padding: 20px;
             border-radius: 10px;
             margin-bottom: 20px;
             text-align: center;
-            transition: transform 0.3s ease;
         }
         .severity-card:hover {
-            transform: translateY(-5px);
+            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.15);
         }
         .header-container {
             display: flex;
@@ -48,11 +70,6 @@ def load_css():
             border-radius: 10px;
             margin-top: 20px;
             text-align: center;
-            animation: fadeIn 0.5s ease-in-out;
-        }
-        @keyframes fadeIn {
-            from { opacity: 0; }
-            to { opacity: 1; }
         }
         .tooltip-icon {
             color: #9CA3AF;
@@ -69,54 +86,94 @@ def load_css():
         }
     </style>
     """
-    st.markdown(css, unsafe_allow_html=True)
+
+def load_css():
+    """Load custom CSS styles."""
+    # The markdown call itself must run every rerun — Streamlit drops
+    # elements that are not re-emitted — but the string build does not
+    st.markdown(_CSS, unsafe_allow_html=True)
 
 def save_prediction(prediction_data):
     """Save a prediction to the session state history."""
     if "predictions" not in st.session_state:
-        st.session_state.predictions = []
-    
-    # Add timestamp to the prediction data
-    prediction_data["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    # Add to history (limit to last 50 predictions)
+        st.session_state.predictions = deque(maxlen=50)
+
+    # Capture the timestamp as a raw integer; formatting is deferred to
+    # the dataframe build where it vectorizes over all rows at once
+    prediction_data["timestamp_ns"] = time.time_ns()
+
+    # Add to history; the deque's maxlen keeps only the last 50 predictions
     st.session_state.predictions.append(prediction_data)
-    if len(st.session_state.predictions) > 50:
-        st.session_state.predictions.pop(0)
 
 def get_severity_color(severity_class):
     """Get the color associated with a severity class."""
-    return SEVERITY_CLASSES.get(severity_class, {}).get("color", "#CCCCCC")
+    if 0 <= severity_class < len(SEVERITY_COLORS):
+        return SEVERITY_COLORS[severity_class]
+    return "#CCCCCC"
 
 def get_severity_label(severity_class):
     """Get the label associated with a severity class."""
-    return SEVERITY_CLASSES.get(severity_class, {}).get("label", "Unknown")
+    if 0 <= severity_class < len(SEVERITY_LABELS):
+        return SEVERITY_LABELS[severity_class]
+    return "Unknown"
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _build_predictions_dataframe(records):
+    """Build the history dataframe, cached on the prediction records.
+
+    The records themselves key the cache — st.cache_data is shared across
+    sessions, so a session-local counter alone would let one session's
+    history collide with another's.
+    """
+    df = pd.DataFrame([dict(row) for row in records])
+
+    # Downcast to compact dtypes instead of the inferred 64-bit defaults
+    df = df.astype(
+        {col: dtype for col, dtype in _HISTORY_DTYPES.items() if col in df.columns}
+    )
+
+    # Materialize the display timestamp in one vectorized pass, converted
+    # to local time so it matches the Predict page's datetime.now() display
+    if "timestamp_ns" in df.columns:
+        local_tz = datetime.now().astimezone().tzinfo
+        df["timestamp"] = (
+            pd.to_datetime(df["timestamp_ns"], unit="ns", utc=True)
+            .dt.tz_convert(local_tz)
+            .dt.strftime("%Y-%m-%d %H:%M:%S")
+        )
+    return df
 
 def get_predictions_dataframe():
     """Convert prediction history to a dataframe."""
     if not st.session_state.predictions:
         return None
-    
-    return pd.DataFrame(st.session_state.predictions)
+
+    # Hashable snapshot of the history; cheap for the 50-entry cap
+    records = tuple(tuple(p.items()) for p in st.session_state.predictions)
+    return _build_predictions_dataframe(records)
 
 def plot_prediction_history(df):
     """Plot the history of predictions."""
-    if df is None or df.empty:
+    # Imported here so pages that never plot skip plotly's import cost;
+    # sys.modules makes repeat imports free
+    import plotly.express as px
+
+    # A distribution of a single prediction isn't informative; skip the
+    # figure build entirely until there is something to show
+    if df is None or len(df) < 2:
         return None
     
-    # Create a bar chart of severity levels
-    severity_counts = df["severity_class"].value_counts().reset_index()
-    severity_counts.columns = ["Severity", "Count"]
-    severity_counts["Severity Label"] = severity_counts["Severity"].apply(get_severity_label)
-    severity_counts["Color"] = severity_counts["Severity"].apply(get_severity_color)
-    
+    # Create a bar chart of severity levels; the counts and mapped labels
+    # feed px.bar directly, skipping the reset_index/rename intermediate
+    # dataframes
+    counts = df["severity_class"].value_counts(sort=False)
+    labels = counts.index.map(_LABEL_MAP)
+
     fig = px.bar(
-        severity_counts, 
-        x="Severity Label", 
-        y="Count", 
-        color="Severity Label",
-        color_discrete_map={label: get_severity_color(sev) for sev, label in 
-                           [(0, "Minimal"), (1, "Minor"), (2, "Moderate"), (3, "Severe")]},
+        x=labels,
+        y=counts.values,
+        color=labels,
+        color_discrete_map=_SEVERITY_COLOR_DISCRETE_MAP,
         title="Prediction Distribution"
     )
     
@@ -125,29 +182,40 @@ def plot_prediction_history(df):
         yaxis_title="Number of Predictions",
         showlegend=False,
         plot_bgcolor="white",
-        font=dict(size=14)
+        font=dict(size=14),
+        # Constant uirevision lets plotly.js diff the existing traces on
+        # re-render instead of tearing them down and recreating them
+        uirevision="severity_history"
     )
     
     return fig
 
 def plot_parameter_importance(df):
     """Create a visualization of parameter importance or trends."""
+    import plotly.express as px
+
     if df is None or df.empty or len(df) < 5:
         return None
     
-    # Calculate correlation between parameters and severity
-    corr_data = []
-    
-    params = ["longitude", "latitude", "distance", "temperature", 
+    # Calculate correlation between parameters and severity with one
+    # np.corrcoef call over a contiguous float64 matrix; the last column is
+    # severity, so the final row gives every parameter's correlation with it
+    params = ["longitude", "latitude", "distance", "temperature",
               "humidity", "pressure", "hour", "time_duration"]
-    
-    for param in params:
-        if param in df.columns:
-            correlation = df[param].corr(df["severity_class"])
-            corr_data.append({"Parameter": param, "Correlation": abs(correlation)})
-    
-    corr_df = pd.DataFrame(corr_data)
-    corr_df = corr_df.sort_values(by="Correlation", ascending=False)
+    present = [param for param in params if param in df.columns]
+
+    mat = df[present + ["severity_class"]].to_numpy(dtype=np.float64, copy=False)
+
+    # Constant columns (e.g. untouched longitude/latitude defaults) divide
+    # by zero variance; silence the warning and keep the NaN, matching the
+    # old Series.corr behaviour
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = np.corrcoef(mat, rowvar=False)[:-1, -1]
+
+    corr_df = (
+        pd.DataFrame({"Parameter": present, "Correlation": np.abs(corr)})
+        .sort_values("Correlation", ascending=False)
+    )
     
     # Create horizontal bar chart
     fig = px.bar(
@@ -163,31 +231,53 @@ def plot_parameter_importance(df):
     fig.update_layout(
         yaxis=dict(categoryorder="total ascending"),
         plot_bgcolor="white",
-        font=dict(size=14)
+        font=dict(size=14),
+        uirevision="severity_history"
     )
     
     return fig
 
-def generate_download_link(df, filename="prediction_history.csv", button_text="Download Data"):
-    """Generate a download link for the prediction history data."""
+@st.cache_data(max_entries=64, show_spinner=False)
+def get_history_figures(df):
+    """Get the (distribution, importance) figure dicts for the history.
+
+    Cached on the dataframe contents — st.cache_data hashes DataFrame
+    arguments, which keeps sessions from colliding on each other's
+    figures. Returns plain figure dicts (st.plotly_chart accepts them
+    directly), which are cheaper to cache and diff than go.Figure objects.
+    """
+    dist_fig = plot_prediction_history(df)
+    importance_fig = plot_parameter_importance(df)
+    return (
+        dist_fig.to_dict() if dist_fig is not None else None,
+        importance_fig.to_dict() if importance_fig is not None else None
+    )
+
+def show_download_button(df, filename="prediction_history.csv", button_text="Download Data"):
+    """Offer the prediction history data as a CSV download.
+
+    st.download_button serves the CSV bytes directly, skipping the base64
+    data-URI inflation of the old HTML link.
+    """
     if df is None or df.empty:
-        return None
-    
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}" class="download-button">{button_text}</a>'
-    return href
+        return
 
-def create_demo_model_folder():
-    """Create a demo model folder structure if it doesn't exist."""
-    model_dir = os.path.join(os.path.dirname(__file__), "model")
-    os.makedirs(model_dir, exist_ok=True)
-    
-    # Create a README file explaining how to add the real model
-    readme_path = os.path.join(model_dir, "README.md")
-    if not os.path.exists(readme_path):
-        with open(readme_path, "w") as f:
-            f.write("""# Traffic Severity Prediction Model
+    # Write straight into a bytes buffer; no intermediate CSV string to
+    # build and re-encode
+    buf = BytesIO()
+    # The raw timestamp_ns column is internal; the formatted timestamp
+    # column already carries the time for the export
+    df.drop(columns="timestamp_ns", errors="ignore").to_csv(buf, index=False)
+
+    st.download_button(
+        label=button_text,
+        data=buf.getvalue(),
+        file_name=filename,
+        mime="text/csv"
+    )
+
+# README content for the demo model folder
+_MODEL_README = """# Traffic Severity Prediction Model
 
 This folder should contain your trained model files:
 
@@ -195,4 +285,18 @@ This folder should contain your trained model files:
 2. `scaler.pkl` - The scaler used to normalize input features
 
 For the demo version, a simulated prediction is used when these files are not present.
-""")
\ No newline at end of file
+"""
+
+@cache
+def create_demo_model_folder():
+    """Create a demo model folder structure if it doesn't exist."""
+    model_dir = Path(__file__).parent / "model"
+    model_dir.mkdir(exist_ok=True)
+
+    # Exclusive-create the README so existence check and write are one
+    # syscall instead of a separate stat plus open
+    try:
+        with (model_dir / "README.md").open("x") as f:
+            f.write(_MODEL_README)
+    except FileExistsError:
+        pass
\ No newline at end of file